@@ -1,9 +1,22 @@
 import os
 import re
+import json
+import math
+import time
+import heapq
+import hashlib
+import zipfile
+import argparse
+import threading
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib.parse import urlparse, unquote
+from urllib.parse import urlparse, unquote, parse_qs
 from dotenv import load_dotenv
+from planning import (
+    get_site_statistics, estimate_work, format_bytes, print_estimate, write_manifest
+)
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -44,6 +57,37 @@ else:
 # 세션 생성
 session = requests.Session()
 
+# 사전 계획(--plan) 설정
+PLAN_BATCH_SIZE = 50  # MediaWiki API의 titles 파라미터 최대 개수
+API_MAX_RETRIES = 3  # 배치 조회 실패 시 재시도 횟수 (maxlag, 요청 제한 등)
+DEFAULT_MANIFEST_FILE = 'plan_manifest.json'
+
+# 제목 → Outline 문서 매핑 파일 (result/ 폴더 안에 저장)
+DOCUMENT_MAP_FILE = 'document_map.json'
+DOCUMENT_MAP_SAVE_INTERVAL = 30  # 실행 중 매핑을 저장하는 간격 (초)
+
+# 업로드 검증(--verify) 설정
+VERIFY_PAGE_SIZE = 100  # documents.list 한 번에 가져올 문서 수
+VERIFY_REPORT_FILE = 'verify_report.json'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# 일괄 가져오기(--archive) 설정
+DEFAULT_ARCHIVE_NAME = 'WIKI'  # 가져오기로 생성될 Outline 컬렉션 이름
+IMPORT_POLL_INTERVAL = 2  # 가져오기 진행 상태 확인 간격 (초)
+IMPORT_TIMEOUT = 60 * 60  # 가져오기 완료를 기다리는 최대 시간 (초)
+
+# 작업 스케줄링 설정
+PAGE_BASE_COST = 2048  # 페이지 크기와 무관한 요청 1회의 고정 비용 (바이트 환산)
+
+# 내비게이션 페이지 (main.py의 check_sidebar_and_navigation과 동일)
+NAVIGATION_PAGES = [
+    "MediaWiki:Sidebar",
+    "MediaWiki:Navigation",
+    "목차",
+    "분류",
+    "위키 구조"
+]
+
 
 def login():
     """MediaWiki에 로그인"""
@@ -87,31 +131,55 @@ def login():
         return False
 
 
-def extract_page_title_from_url(url):
-    """URL에서 페이지 제목 추출"""
+def resize_session_pool(pool_size):
+    """동시 작업 수만큼 위키 세션의 연결 풀 크기 조정 (기본값 10개)"""
+    adapter = requests.adapters.HTTPAdapter(
+        pool_maxsize=max(pool_size, requests.adapters.DEFAULT_POOLSIZE)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+
+def parse_wiki_url(url):
+    """URL이 가리키는 페이지 식별
+
+    반환값: ('title', 제목), ('pageid', 문서 번호), ('revid', 판 번호) 또는 None
+    """
     # URL 파싱
     parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+
+    # ?curid=123, ?oldid=456 형식 (MediaWiki와 같이 제목보다 우선)
+    for key, kind in [('curid', 'pageid'), ('oldid', 'revid')]:
+        if key in query and query[key][0].isdigit():
+            return kind, int(query[key][0])
 
     # /index.php/PageTitle 형식
     if '/index.php/' in parsed.path:
-        title = parsed.path.split('/index.php/', 1)[1]
-        return unquote(title)
+        return 'title', unquote(parsed.path.split('/index.php/', 1)[1])
 
     # /wiki/PageTitle 형식
     if '/wiki/' in parsed.path:
-        title = parsed.path.split('/wiki/', 1)[1]
-        return unquote(title)
+        return 'title', unquote(parsed.path.split('/wiki/', 1)[1])
 
     # 쿼리 파라미터에서 title 추출 (?title=PageTitle)
-    if '?' in url:
-        from urllib.parse import parse_qs
-        query = parse_qs(parsed.query)
-        if 'title' in query:
-            return query['title'][0]
+    if 'title' in query:
+        return 'title', query['title'][0]
 
     return None
 
 
+def normalize_title(title, first_letter_case=False):
+    """위키 제목 표기 통일 (밑줄 → 공백, 연속 공백 정리)
+
+    first_letter_case: 위키가 첫 글자 대소문자를 구분하지 않으면($wgCapitalLinks) 첫 글자를 대문자로
+    """
+    title = re.sub(r'[\s_]+', ' ', title).strip()
+    if first_letter_case:
+        title = title[:1].upper() + title[1:]
+    return title
+
+
 def get_page_content_with_sections(title):
     """페이지 내용과 섹션 구조 가져오기"""
     params = {
@@ -203,6 +271,610 @@ def read_urls_from_file(filename='urls.txt'):
     return urls
 
 
+def is_first_letter_case():
+    """위키가 제목 첫 글자의 대소문자를 구분하지 않는지 확인 (siprop=general의 case)
+
+    확인할 수 없으면 False (대소문자를 바꾸지 않고 API의 제목 정규화에 맡김)
+    """
+    params = {
+        "action": "query",
+        "meta": "siteinfo",
+        "siprop": "general",
+        "format": "json"
+    }
+
+    try:
+        response = session.get(api_url, params=params, timeout=60)
+        data = response.json()
+    except (requests.exceptions.RequestException, ValueError):
+        return False
+
+    return data.get('query', {}).get('general', {}).get('case') == 'first-letter'
+
+
+def post_wiki_batch(params):
+    """배치 조회 요청 (실패하면 간격을 늘려가며 재시도, 끝내 실패하면 None)"""
+    for attempt in range(API_MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(2 ** attempt)
+
+        try:
+            # 제목이 길어질 수 있으므로 POST로 전송
+            response = session.post(api_url, data=params, timeout=60)
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            error = str(e)
+            continue
+
+        if 'error' not in data:
+            return data
+        error = data['error'].get('info', '알 수 없는 오류')
+
+    print(f"  ✗ API 에러 ({API_MAX_RETRIES}회 재시도 후): {error}")
+    return None
+
+
+def get_pages_info(titles):
+    """페이지 메타데이터(length, lastrevid)를 50개씩 배치로 가져오기 (prop=info)
+
+    리다이렉트 문서는 같은 요청에서 대상 문서로 해석하고 원래 제목을 redirected_from에 기록
+    반환값: {요청한 제목: 페이지 정보} 딕셔너리
+            (조회에 실패한 배치의 제목은 포함하지 않음 → 크기 정보 없이 처리)
+    """
+    info = {}
+
+    for start in range(0, len(titles), PLAN_BATCH_SIZE):
+        if start and start % (PLAN_BATCH_SIZE * 20) == 0:
+            print(f"  페이지 정보 조회 중... ({start}/{len(titles)})")
+
+        batch = titles[start:start + PLAN_BATCH_SIZE]
+        params = {
+            "action": "query",
+            "titles": "|".join(batch),
+            "prop": "info",
+            "redirects": "1",
+            "format": "json"
+        }
+
+        data = post_wiki_batch(params)
+        if data is None:
+            continue
+
+        query = data.get('query', {})
+        # 위키가 정규화한 제목 (예: Main_Page → Main Page)
+        normalized = {n['from']: n['to'] for n in query.get('normalized', [])}
+        redirects = {r['from']: r['to'] for r in query.get('redirects', [])}
+        pages_by_title = {p.get('title'): p for p in query.get('pages', {}).values()}
+
+        for title in batch:
+            source = normalized.get(title, title)
+
+            # 리다이렉트를 따라 최종 대상 문서 찾기 (순환 리다이렉트 방지)
+            target = source
+            visited = {target}
+            while target in redirects and redirects[target] not in visited:
+                target = redirects[target]
+                visited.add(target)
+
+            page = pages_by_title.get(target)
+            if page is None:
+                continue
+            # Special:/Media: 문서는 pageid 없이 special 표시만 돌아옴 → 변환 불가
+            if ('missing' in page or 'invalid' in page or 'special' in page
+                    or page.get('pageid') is None):
+                info[title] = {'title': title, 'missing': True}
+                continue
+
+            info[title] = {
+                'title': page['title'],
+                'pageid': page.get('pageid'),
+                'length': page.get('length', 0),
+                'lastrevid': page.get('lastrevid'),
+                'missing': False
+            }
+            if target != source:
+                info[title]['redirected_from'] = source
+
+    return info
+
+
+def resolve_ids_to_titles(kind, ids):
+    """문서 번호(pageid) 또는 판 번호(revid)를 50개씩 배치로 조회해 제목으로 변환
+
+    반환값: {번호: 제목} 딕셔너리 (존재하지 않는 번호는 제외)
+    """
+    titles = {}
+
+    for start in range(0, len(ids), PLAN_BATCH_SIZE):
+        batch = ids[start:start + PLAN_BATCH_SIZE]
+        params = {
+            "action": "query",
+            f"{kind}s": "|".join(str(i) for i in batch),
+            "format": "json"
+        }
+        if kind == 'revid':
+            params.update({"prop": "revisions", "rvprop": "ids"})
+        else:
+            params["prop"] = "info"
+
+        data = post_wiki_batch(params)
+        if data is None:
+            continue
+
+        for page in data.get('query', {}).get('pages', {}).values():
+            if 'missing' in page or 'invalid' in page:
+                continue
+            if kind == 'revid':
+                for revision in page.get('revisions', []):
+                    titles[revision['revid']] = page['title']
+            else:
+                titles[page['pageid']] = page['title']
+
+    return titles
+
+
+def read_manifest(filename):
+    """manifest 파일에서 작업 목록 읽기 (없는 페이지는 제외)"""
+    if not os.path.exists(filename):
+        print(f"오류: '{filename}' 파일을 찾을 수 없습니다.")
+        return []
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    return [p for p in manifest.get('pages', []) if not p.get('missing')]
+
+
+def read_pages_from_urls(filename='urls.txt'):
+    """URL 목록 파일에서 작업 목록 생성
+
+    제목은 로컬에서 정규화하고, curid/oldid 형식은 배치 조회로 제목을 확정
+    (같은 문서를 가리키는 입력은 fill_pages_info와 collapse_aliases에서 합쳐짐)
+    """
+    targets = []
+    ids = {'pageid': [], 'revid': []}
+    first_letter_case = is_first_letter_case()
+
+    for url in read_urls_from_file(filename):
+        target = parse_wiki_url(url)
+        if target is None:
+            print(f"  ✗ URL에서 페이지 제목을 추출할 수 없습니다: {url}")
+            continue
+
+        kind, value = target
+        if kind == 'title':
+            value = normalize_title(value, first_letter_case)
+        else:
+            ids[kind].append(value)
+        targets.append((url, kind, value))
+
+    # 번호로 지정된 페이지의 제목 확인
+    id_titles = {
+        kind: resolve_ids_to_titles(kind, list(dict.fromkeys(values)))
+        for kind, values in ids.items() if values
+    }
+
+    pages = []
+    for url, kind, value in targets:
+        if kind == 'title':
+            pages.append({'url': url, 'title': value})
+        elif value in id_titles[kind]:
+            pages.append({'url': url, 'title': id_titles[kind][value]})
+        else:
+            pages.append({'url': url, 'title': f"{kind}={value}", 'missing': True})
+
+    return pages
+
+
+def fill_pages_info(pages):
+    """크기 정보가 없거나 리다이렉트로 표시된 페이지를 prop=info 배치 조회로 채우기
+
+    반환값: 배치 요청 수
+    """
+    # main.py manifest의 페이지는 크기 정보가 있지만 리다이렉트는 대상 문서로 해석해야 함
+    # (번호를 제목으로 바꾸지 못한 페이지는 제목이 없으므로 제외)
+    lookup = [
+        p for p in pages
+        if not p.get('missing') and ('length' not in p or p.get('redirect'))
+    ]
+    titles = list(dict.fromkeys(p['title'] for p in lookup))
+    if not titles:
+        return 0
+
+    info = get_pages_info(titles)
+    for page in lookup:
+        page.pop('redirect', None)
+        # 조회에 실패한 페이지는 크기 정보 없이 그대로 처리 (비용 = PAGE_BASE_COST)
+        page.update(info.get(page['title'], {}))
+
+    return math.ceil(len(titles) / PLAN_BATCH_SIZE)
+
+
+def plan(manifest_file, workers=1, archive=False):
+    """메타데이터 조회만으로 작업량을 추정하고 manifest 저장 (archive: --archive 기준으로 추정)"""
+    print("\n[사전 계획 모드] 메타데이터만 조회하여 작업량을 추정합니다.")
+
+    pages = read_pages_from_urls('urls.txt')
+    if not pages:
+        print("\n처리할 URL이 없습니다.")
+        return
+
+    statistics = get_site_statistics(session, api_url)
+
+    # 배치 요청의 평균 응답 시간으로 요청당 지연 시간 측정
+    started = time.time()
+    batch_count = fill_pages_info(pages)
+    request_latency = (time.time() - started) / max(1, batch_count)
+
+    unique_pages, aliases = collapse_aliases([p for p in pages if not p.get('missing')])
+
+    upload_mode = None
+    if use_outline:
+        upload_mode = 'archive' if archive else 'documents'
+    estimate = estimate_work(unique_pages, request_latency, workers, upload_mode)
+    write_manifest(manifest_file, pages, estimate, statistics, 'urls.txt')
+
+    missing = [p for p in pages if p.get('missing')]
+
+    print("\n" + "=" * 60)
+    print("사전 계획 결과")
+    print("=" * 60)
+    if statistics:
+        print(f"위키 전체 문서 수: {statistics.get('pages', 'N/A')}개 "
+              f"(본문 {statistics.get('articles', 'N/A')}개)")
+    print(f"처리 대상 페이지: {estimate['pages']}개 (존재하지 않음: {len(missing)}개, "
+          f"리다이렉트 별칭: {len(aliases)}개)")
+    print_estimate(estimate)
+    for page in missing:
+        print(f"  ✗ 존재하지 않는 페이지: {page['title']}")
+    print(f"\n✓ 작업 목록 저장: {manifest_file}")
+    print(f"  실제 실행: python convert_to_outline.py --manifest {manifest_file}")
+    print("=" * 60)
+
+
+def get_navigation_titles(first_letter_case=False):
+    """내비게이션 페이지와 그 페이지에서 링크된 문서 제목 가져오기"""
+    params = {
+        "action": "query",
+        "titles": "|".join(NAVIGATION_PAGES),
+        "prop": "revisions",
+        "rvprop": "content",
+        "rvslots": "main",
+        "format": "json"
+    }
+
+    titles = set()
+    data = post_wiki_batch(params)
+    if data is None:
+        print("  ⚠ 내비게이션 페이지를 가져오지 못해 우선순위 없이 진행합니다")
+        return titles
+
+    for page in data.get('query', {}).get('pages', {}).values():
+        if 'revisions' not in page:
+            continue
+        titles.add(page['title'])
+        content = page['revisions'][0]['slots']['main']['*']
+
+        # [[문서|표시 이름]] 형식의 링크
+        for link in re.findall(r'\[\[([^\]|#]+)', content):
+            titles.add(normalize_title(link, first_letter_case))
+
+        # MediaWiki:Sidebar의 "** 문서|표시 이름" 형식
+        for link in re.findall(r'^\*\*\s*([^|\n]+)\|', content, re.MULTILINE):
+            titles.add(normalize_title(link, first_letter_case))
+
+    return titles
+
+
+def read_priority_titles(filename, first_letter_case=False):
+    """우선 처리할 문서 제목 목록 읽기 (한 줄에 하나, '#' 주석 무시)"""
+    titles = set()
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                titles.add(normalize_title(line, first_letter_case))
+
+    return titles
+
+
+def collapse_aliases(pages):
+    """같은 문서를 가리키는 작업을 입력 순서대로 하나로 합치기
+
+    반환값: (중복 없는 작업 목록, {리다이렉트 제목: 대상 문서 제목})
+    """
+    unique = {}
+    aliases = {}
+
+    for page in pages:
+        unique.setdefault(page['title'], page)
+
+        source = page.get('redirected_from')
+        if source:
+            aliases[source] = page['title']
+
+    return list(unique.values()), aliases
+
+
+class DocumentMap:
+    """위키 제목 → Outline 문서 매핑 (리다이렉트와 중복 문서는 별칭으로만 기록)"""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.lock = threading.Lock()
+        # 처리 중인 내용 해시가 끝나기를 기다리는 작업자를 깨우는 용도
+        self.claim_released = threading.Condition(self.lock)
+        self.documents = {}
+        self.aliases = {}
+
+        if os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.documents = data.get('documents', {})
+            self.aliases = data.get('aliases', {})
+
+        # 이전 실행에서 처리한 문서도 중복 판단에 사용 (업로드에 실패한 문서는 제외)
+        self.content_hashes = {
+            doc['sha1']: title for title, doc in self.documents.items()
+            if doc.get('sha1') and not doc.get('upload_failed')
+        }
+        # {내용 해시: 처리 중인 문서 제목} (저장·업로드가 끝나면 content_hashes로 옮김)
+        self.pending = {}
+        self.last_saved = time.time()
+
+    def claim_content(self, title, content_hash):
+        """내용 해시를 이 문서가 처리하도록 선점
+
+        같은 내용으로 이미 저장·업로드된 다른 문서가 있으면 그 제목 반환
+        다른 작업자가 같은 내용을 처리 중이면 그 결과가 나올 때까지 기다림
+        (선점한 문서는 add_document 또는 release_claim으로 반드시 해제해야 함)
+        """
+        with self.lock:
+            while True:
+                owner = self.content_hashes.get(content_hash, title)
+                if owner != title:
+                    return owner
+
+                pending_owner = self.pending.setdefault(content_hash, title)
+                if pending_owner == title:
+                    return None
+                self.claim_released.wait()
+
+    def release_claim(self, title, content_hash):
+        """처리에 실패한 문서의 선점 해제 (기다리던 다른 문서가 대신 처리)"""
+        with self.lock:
+            if self.pending.get(content_hash) == title:
+                del self.pending[content_hash]
+                self.claim_released.notify_all()
+
+    def add_document(self, title, file, url, content_hash, archive=None, upload_failed=False,
+                     remote=None):
+        """변환된 문서 기록 (archive: 일괄 가져오기로 올린 경우 ZIP 파일 경로,
+        remote: 업로드 응답으로 받은 Outline 본문의 해시와 길이)
+
+        업로드에 실패한 문서는 같은 내용의 다른 문서를 별칭으로 만들지 않음
+        (claim_content로 선점한 내용 해시는 여기서 해제)
+        """
+        with self.lock:
+            self.documents[title] = {'file': file, 'url': url, 'sha1': content_hash}
+            if remote:
+                self.documents[title]['remote_sha256'] = remote['sha256']
+                self.documents[title]['remote_bytes'] = remote['bytes']
+            if archive:
+                self.documents[title]['archive'] = archive
+            if upload_failed:
+                self.documents[title]['upload_failed'] = True
+            else:
+                self.content_hashes.setdefault(content_hash, title)
+            self.aliases.pop(title, None)
+
+            if self.pending.get(content_hash) == title:
+                del self.pending[content_hash]
+                self.claim_released.notify_all()
+
+    def add_alias(self, title, target, reason):
+        """별칭 기록 (reason: 'redirect' 또는 'duplicate')"""
+        with self.lock:
+            self.aliases[title] = {'target': target, 'reason': reason}
+
+    def save(self):
+        """매핑을 파일로 저장 (중단되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체)"""
+        with self.lock:
+            temp_file = f"{self.filename}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({'documents': self.documents, 'aliases': self.aliases},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(temp_file, self.filename)
+            self.last_saved = time.time()
+
+    def save_if_due(self):
+        """마지막 저장 후 DOCUMENT_MAP_SAVE_INTERVAL초가 지났으면 저장"""
+        if time.time() - self.last_saved >= DOCUMENT_MAP_SAVE_INTERVAL:
+            self.save()
+
+
+def archive_path(collection_name, title):
+    """문서 제목을 ZIP 내부 경로로 변환 (하위 페이지는 상위 페이지 이름의 폴더 아래에 위치)"""
+    parts = [re.sub(r'[<>:"\\|?*]', '_', part).strip() or '_' for part in title.split('/')]
+    return f"{collection_name}/{'/'.join(parts)}.md"
+
+
+class MarkdownArchive:
+    """변환 결과를 Outline 가져오기용 Markdown ZIP에 한 문서씩 추가"""
+
+    def __init__(self, filename, collection_name):
+        self.filename = filename
+        self.collection_name = collection_name
+        self.lock = threading.Lock()
+        self.names = set()
+        self.zip = zipfile.ZipFile(filename, 'w', compression=zipfile.ZIP_DEFLATED)
+
+    def add(self, title, source_file):
+        """결과 파일을 ZIP에 추가 (파일에서 조각 단위로 읽어 압축)"""
+        with self.lock:
+            name = archive_path(self.collection_name, title)
+            # 파일명 정리 후 경로가 겹치면 번호를 붙임
+            number = 2
+            while name in self.names:
+                name = archive_path(self.collection_name, f"{title} ({number})")
+                number += 1
+            self.names.add(name)
+            self.zip.write(source_file, name)
+
+    def close(self):
+        """ZIP 파일 마무리"""
+        with self.lock:
+            self.zip.close()
+
+
+def page_cost(page):
+    """페이지 처리 비용 추정값 (크기 + 고정 비용)"""
+    return page.get('length', 0) + PAGE_BASE_COST
+
+
+def simulate_makespan(durations, workers):
+    """주어진 순서대로 빈 작업자에게 배정했을 때의 전체 소요 시간 계산"""
+    loads = [0.0] * workers
+    for duration in durations:
+        heapq.heappush(loads, heapq.heappop(loads) + duration)
+    return max(loads)
+
+
+class WorkStealingScheduler:
+    """큰 페이지부터(LPT) 작업자별 큐에 분배하고, 큐가 빈 작업자는 다른 큐의 작업을 가져감"""
+
+    def __init__(self, pages, workers, priority_titles=()):
+        self.lock = threading.Lock()
+        self.queues = [deque() for _ in range(workers)]
+        self.loads = [0] * workers
+
+        # 우선순위 페이지 먼저, 그다음 큰 페이지 순서
+        self.order = sorted(
+            pages,
+            key=lambda p: (p['title'] not in priority_titles, -page_cost(p))
+        )
+
+        # 남은 작업량이 가장 적은 작업자에게 차례로 배정
+        for page in self.order:
+            worker_id = self.loads.index(min(self.loads))
+            self.queues[worker_id].append(page)
+            self.loads[worker_id] += page_cost(page)
+
+    def next_page(self, worker_id):
+        """작업자의 다음 페이지 반환 (자기 큐가 비면 가장 바쁜 작업자의 가장 작은 작업을 가져옴)"""
+        with self.lock:
+            queue = self.queues[worker_id]
+            if queue:
+                page = queue.popleft()
+            else:
+                victim = self.loads.index(max(self.loads))
+                if not self.queues[victim]:
+                    return None
+                page = self.queues[victim].pop()
+                worker_id = victim
+
+            self.loads[worker_id] -= page_cost(page)
+            return page
+
+
+def process_page(page, result_dir, document_map, archive=None):
+    """페이지 하나를 가져와 변환 후 저장 및 업로드 (출력할 로그와 결과 반환)
+
+    archive가 있으면 문서별 업로드 대신 ZIP에 추가
+    """
+    page_title = page['title']
+    result = {
+        'log': [f"  페이지 제목: {page_title}"],
+        'converted': False,
+        'outline': None,
+        'duplicate': False
+    }
+
+    # 페이지 내용 가져오기
+    sections, wikitext = get_page_content_with_sections(page_title)
+
+    if wikitext is None:
+        result['log'].append(f"  ✗ 페이지를 가져올 수 없습니다.")
+        return result
+
+    # 내용이 완전히 같은 문서가 이미 있으면 별칭으로만 기록하고 업로드 생략
+    # (같은 내용을 다른 작업자가 처리 중이면 그 결과를 기다린 뒤 판단)
+    content_hash = hashlib.sha1(wikitext.encode('utf-8')).hexdigest()
+    duplicate_of = document_map.claim_content(page_title, content_hash)
+    if duplicate_of:
+        document_map.add_alias(page_title, duplicate_of, 'duplicate')
+        result['log'].append(f"  = '{duplicate_of}' 문서와 내용이 같아 별칭으로 기록합니다.")
+        result['duplicate'] = True
+        return result
+
+    try:
+        # Outline 포맷으로 변환
+        outline_content = convert_wikitext_to_outline(page_title, sections, wikitext)
+
+        # 파일명 생성 (페이지 제목 기반)
+        safe_filename = sanitize_filename(page_title)
+        output_file = result_dir / f"{safe_filename}.txt"
+
+        # 파일 저장 (백업용)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(outline_content)
+
+        result['log'].append(f"  ✓ 파일 저장: {output_file}")
+        result['converted'] = True
+
+        # Outline API로 문서 생성
+        doc_url = None
+        remote = None
+        if archive is not None:
+            archive.add(page_title, output_file)
+            result['log'].append(f"  ✓ 가져오기 파일에 추가: {archive.filename}")
+        elif use_outline:
+            result['log'].append(f"  → Outline에 문서 생성 중...")
+            success, message, remote = create_outline_document(page_title, outline_content)
+
+            if success:
+                result['log'].append(f"  ✓ Outline 생성 완료: {message}")
+                doc_url = message
+            else:
+                result['log'].append(f"  ✗ Outline 생성 실패: {message}")
+            result['outline'] = success
+
+        document_map.add_document(page_title, str(output_file), doc_url, content_hash,
+                                  str(archive.filename) if archive is not None else None,
+                                  upload_failed=result['outline'] is False, remote=remote)
+    except BaseException:
+        # 같은 내용을 기다리는 다른 작업자가 멈추지 않도록 선점 해제
+        document_map.release_claim(page_title, content_hash)
+        raise
+
+    return result
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="위키 페이지 → Outline 변환 도구")
+    parser.add_argument('--plan', action='store_true',
+                        help="메타데이터만 조회하여 작업량을 추정하고 manifest 저장")
+    parser.add_argument('--manifest', metavar='FILE',
+                        help="urls.txt 대신 --plan으로 저장한 manifest 사용 "
+                             "(--plan과 함께 쓰면 저장할 경로)")
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help="동시에 처리할 페이지 수 (기본값: 1)")
+    parser.add_argument('--nav-first', action='store_true',
+                        help="내비게이션 페이지와 그 링크 대상을 먼저 처리")
+    parser.add_argument('--priority', metavar='FILE',
+                        help="먼저 처리할 문서 제목 목록 파일 (한 줄에 하나)")
+    parser.add_argument('--verify', action='store_true',
+                        help="업로드된 Outline 문서를 result/ 파일과 비교")
+    parser.add_argument('--reupload', action='store_true',
+                        help="--verify에서 누락/불일치로 확인된 문서만 다시 업로드")
+    parser.add_argument('--archive', nargs='?', const=DEFAULT_ARCHIVE_NAME, metavar='NAME',
+                        help="문서별 업로드 대신 Markdown ZIP으로 묶어 NAME 컬렉션으로 "
+                             f"한 번에 가져오기 (기본값: {DEFAULT_ARCHIVE_NAME})")
+    return parser.parse_args()
+
+
 def get_outline_collections():
     """Outline의 모든 Collection 목록 가져오기"""
     if not use_outline:
@@ -234,9 +906,12 @@ def get_outline_collections():
 
 
 def create_outline_document(title, content):
-    """Outline API를 통해 문서 생성"""
+    """Outline API를 통해 문서 생성
+
+    반환값: (성공 여부, 문서 URL 또는 오류 메시지, Outline이 저장한 본문의 요약 또는 None)
+    """
     if not use_outline:
-        return False, "Outline 설정이 없습니다."
+        return False, "Outline 설정이 없습니다.", None
 
     # API URL 확인 (끝에 /api가 없으면 추가)
     api_base = outline_api_url.rstrip('/')
@@ -264,8 +939,8 @@ def create_outline_document(title, content):
             data = response.json()
             if 'data' in data:
                 doc_url = data['data'].get('url', '')
-                return True, doc_url
-            return True, "문서 생성 성공"
+                return True, doc_url, summarize_saved_text(data['data'])
+            return True, "문서 생성 성공", None
         else:
             error_msg = f"HTTP {response.status_code}"
             try:
@@ -278,7 +953,423 @@ def create_outline_document(title, content):
                 print(f"  [DEBUG] Collection ID 길이: {len(outline_collection_id)}")
             except:
                 pass
-            return False, error_msg
+            return False, error_msg, None
+
+    except requests.exceptions.Timeout:
+        return False, "타임아웃 (30초)", None
+    except requests.exceptions.RequestException as e:
+        return False, str(e), None
+
+
+def get_outline_api_base():
+    """Outline API 기본 URL (끝에 /api가 없으면 추가)"""
+    api_base = outline_api_url.rstrip('/')
+    if not api_base.endswith('/api'):
+        api_base += '/api'
+    return api_base
+
+
+def create_outline_session(pool_size):
+    """동시 요청 수만큼 연결을 재사용하는 Outline API 세션 생성"""
+    client = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    client.mount('http://', adapter)
+    client.mount('https://', adapter)
+    client.headers.update({
+        "Authorization": f"Bearer {outline_api_token}",
+        "Content-Type": "application/json"
+    })
+    return client
+
+
+def summarize_remote_document(doc):
+    """Outline 문서에서 비교에 필요한 정보만 남기기 (본문은 해시와 길이로 대체)"""
+    text = doc.get('text', '').encode('utf-8')
+    return {
+        'id': doc['id'],
+        'urlId': doc.get('urlId') or doc.get('url', '').rsplit('-', 1)[-1],
+        'sha256': hashlib.sha256(text).hexdigest(),
+        'bytes': len(text)
+    }
+
+
+def summarize_saved_text(doc):
+    """생성/수정 응답에서 Outline이 실제로 저장한 본문의 해시와 길이 (본문이 없으면 None)
+
+    Outline은 본문을 자체 문서 모델로 다시 만들어 돌려주므로, 검증은 로컬 파일이 아닌 이 값과 비교
+    """
+    if 'text' not in doc:
+        return None
+    summary = summarize_remote_document(doc)
+    return {'sha256': summary['sha256'], 'bytes': summary['bytes']}
+
+
+def list_outline_documents(client, workers):
+    """컬렉션의 모든 문서를 여러 페이지씩 동시에 조회 (반환값: {urlId: 문서 요약})"""
+    endpoint = f"{get_outline_api_base()}/documents.list"
+
+    def fetch(offset):
+        payload = {
+            "collectionId": outline_collection_id,
+            "offset": offset,
+            "limit": VERIFY_PAGE_SIZE
+        }
+        try:
+            response = client.post(endpoint, json=payload, timeout=30)
+            if response.status_code == 200:
+                return [summarize_remote_document(d) for d in response.json().get('data', [])]
+        except requests.exceptions.RequestException:
+            pass
+        return None
+
+    documents = {}
+    offset = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            offsets = [offset + i * VERIFY_PAGE_SIZE for i in range(workers)]
+            batches = list(executor.map(fetch, offsets))
+
+            if any(batch is None for batch in batches):
+                return None
+
+            for batch in batches:
+                for doc in batch:
+                    documents[doc['urlId']] = doc
+
+            # 한 페이지라도 덜 채워졌으면 마지막 페이지
+            if any(len(batch) < VERIFY_PAGE_SIZE for batch in batches):
+                break
+            offset += workers * VERIFY_PAGE_SIZE
+            print(f"  문서 목록 조회 중... (현재 {len(documents)}개)")
+
+    return documents
+
+
+def get_outline_document(client, doc_id):
+    """documents.info로 문서 하나 조회
+
+    반환값: (문서 요약 또는 None, 오류 메시지 또는 None)
+            문서가 없거나(404) 휴지통에 있으면 (None, None),
+            그 밖의 이유로 확인하지 못하면 (None, 오류 메시지)
+    """
+    endpoint = f"{get_outline_api_base()}/documents.info"
+
+    try:
+        response = client.post(endpoint, json={"id": doc_id}, timeout=30)
+
+        if response.status_code == 404:
+            return None, None
+
+        if response.status_code == 200:
+            data = response.json()['data']
+            # 휴지통으로 옮긴 문서도 documents.info로는 조회됨
+            if data.get('deletedAt'):
+                return None, None
+            return summarize_remote_document(data), None
+
+        error_msg = f"HTTP {response.status_code}"
+        try:
+            error_msg = response.json().get('message', error_msg)
+        except ValueError:
+            pass
+        return None, error_msg
+
+    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+        return None, str(e)
+
+
+def update_outline_document(client, doc_id, content):
+    """documents.update로 기존 문서 내용 교체 (반환값은 create_outline_document와 같음)"""
+    endpoint = f"{get_outline_api_base()}/documents.update"
+
+    try:
+        response = client.post(endpoint, json={"id": doc_id, "text": content}, timeout=30)
+
+        if response.status_code == 200:
+            data = response.json().get('data', {})
+            return True, data.get('url', ''), summarize_saved_text(data)
+
+        error_msg = f"HTTP {response.status_code}"
+        try:
+            error_msg = response.json().get('message', error_msg)
+        except ValueError:
+            pass
+        return False, error_msg, None
+
+    except requests.exceptions.Timeout:
+        return False, "타임아웃 (30초)", None
+    except requests.exceptions.RequestException as e:
+        return False, str(e), None
+
+
+def hash_local_file(path, prefix_bytes):
+    """파일을 조각 단위로 읽어 전체 해시, 크기, 앞부분(prefix_bytes) 해시 계산"""
+    full_hash = hashlib.sha256()
+    prefix_hash = hashlib.sha256()
+    size = 0
+
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            full_hash.update(chunk)
+            if size < prefix_bytes:
+                prefix_hash.update(chunk[:prefix_bytes - size])
+            size += len(chunk)
+
+    return full_hash.hexdigest(), size, prefix_hash.hexdigest()
+
+
+def verify_document(client, title, doc, remote_docs):
+    """Outline 문서가 업로드 당시 그대로인지 확인
+
+    업로드 응답의 본문 해시(remote_sha256)가 기록되어 있으면 그것과 비교하고,
+    기록이 없는 이전 문서만 로컬 결과 파일과 직접 비교
+    status: ok, missing(Outline에 없음), truncated(앞부분만 일치 또는 길이가 줄어듦),
+            drifted(내용 다름), local_missing(로컬 파일 없음),
+            archived(일괄 가져오기로 올려 문서 URL이 없음),
+            error(Outline 조회 실패로 확인하지 못함)
+    """
+    entry = {'title': title, 'file': doc['file'], 'url': doc.get('url')}
+
+    if doc.get('archive') and not doc.get('url'):
+        entry['status'] = 'archived'
+        return entry
+
+    if not os.path.exists(doc['file']):
+        entry['status'] = 'local_missing'
+        return entry
+
+    remote = None
+    if doc.get('url'):
+        url_id = doc['url'].rsplit('-', 1)[-1]
+        remote = remote_docs.get(url_id)
+
+    if remote is None and doc.get('url'):
+        # 컬렉션 목록에 없으면 다른 곳으로 옮겨졌을 수 있으므로 직접 조회
+        remote, error = get_outline_document(client, url_id)
+        if error:
+            # 문서가 남아 있을 수 있으므로 missing으로 보고 다시 만들지 않음
+            entry.update({'status': 'error', 'error': error})
+            return entry
+
+    if remote is None:
+        entry['status'] = 'missing'
+        return entry
+
+    entry.update({'id': remote['id'], 'remote_bytes': remote['bytes']})
+
+    if doc.get('remote_sha256'):
+        entry['expected_bytes'] = doc['remote_bytes']
+        if remote['sha256'] == doc['remote_sha256']:
+            entry['status'] = 'ok'
+        elif remote['bytes'] < doc['remote_bytes']:
+            entry['status'] = 'truncated'
+        else:
+            entry['status'] = 'drifted'
+        return entry
+
+    local_hash, local_bytes, prefix_hash = hash_local_file(doc['file'], remote['bytes'])
+    entry['local_bytes'] = local_bytes
+
+    if local_hash == remote['sha256']:
+        entry['status'] = 'ok'
+    elif remote['bytes'] < local_bytes and prefix_hash == remote['sha256']:
+        entry['status'] = 'truncated'
+    else:
+        entry['status'] = 'drifted'
+
+    return entry
+
+
+def reupload_document(client, entry, document_map):
+    """검증에 실패한 문서 다시 업로드 (없으면 생성, 있으면 내용 교체)"""
+    with open(entry['file'], 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    if entry['status'] == 'missing':
+        success, message, remote = create_outline_document(entry['title'], content)
+    else:
+        success, message, remote = update_outline_document(client, entry['id'], content)
+
+    # 다음 검증에서 비교할 수 있도록 Outline이 저장한 본문의 해시 기록
+    if success:
+        doc = document_map.documents[entry['title']]
+        url = message if entry['status'] == 'missing' else doc.get('url')
+        document_map.add_document(entry['title'], doc['file'], url, doc.get('sha1'),
+                                  remote=remote)
+
+    return entry['title'], success, message
+
+
+def verify(workers, reupload=False):
+    """업로드된 문서가 업로드 당시 그대로인지 확인하고 결과를 JSON으로 저장"""
+    print("\n[업로드 검증 모드] Outline 문서를 업로드 당시 내용과 비교합니다.")
+
+    if not use_outline:
+        print("✗ Outline 설정이 없어 검증할 수 없습니다.")
+        return
+
+    document_map = DocumentMap(Path('result') / DOCUMENT_MAP_FILE)
+    if not document_map.documents:
+        print(f"✗ 'result/{DOCUMENT_MAP_FILE}'에 기록된 문서가 없습니다. 먼저 변환을 실행하세요.")
+        return
+
+    client = create_outline_session(workers)
+
+    remote_docs = list_outline_documents(client, workers)
+    if remote_docs is None:
+        print("✗ Outline 문서 목록을 가져올 수 없습니다.")
+        print("  API URL과 Token을 확인하세요.")
+        return
+    print(f"  Outline 컬렉션 문서: {len(remote_docs)}개")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        entries = list(executor.map(
+            lambda item: verify_document(client, item[0], item[1], remote_docs),
+            document_map.documents.items()
+        ))
+
+    report = {'checked': len(entries), 'ok': 0}
+    for status in ['missing', 'truncated', 'drifted', 'local_missing', 'archived', 'error']:
+        report[status] = []
+    for entry in entries:
+        if entry['status'] == 'ok':
+            report['ok'] += 1
+        else:
+            report[entry['status']].append(entry)
+    report['checked'] -= len(report['archived'])
+
+    with open(VERIFY_REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print("\n" + "=" * 60)
+    print(f"검증 완료: {report['checked']}개 중 {report['ok']}개 일치")
+    print(f"  ✗ Outline에 없음: {len(report['missing'])}개")
+    print(f"  ✗ 내용 잘림: {len(report['truncated'])}개")
+    print(f"  ✗ 내용 다름: {len(report['drifted'])}개")
+    if report['local_missing']:
+        print(f"  ? 로컬 파일 없음: {len(report['local_missing'])}개")
+    if report['archived']:
+        print(f"  - 일괄 가져오기 문서 (검증 제외): {len(report['archived'])}개")
+    if report['error']:
+        print(f"  ? 조회 실패 (다시 업로드하지 않음): {len(report['error'])}개")
+    print(f"결과 파일: {VERIFY_REPORT_FILE}")
+
+    failed = report['missing'] + report['truncated'] + report['drifted']
+    if reupload and failed:
+        print(f"\n{len(failed)}개의 문서를 다시 업로드합니다...")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda entry: reupload_document(client, entry, document_map), failed
+            ))
+
+        for title, success, message in results:
+            if success:
+                print(f"  ✓ {title}: {message}")
+            else:
+                print(f"  ✗ {title}: {message}")
+        document_map.save()
+    print("=" * 60)
+
+
+class MultipartFileStream:
+    """파일 하나를 담은 multipart/form-data 본문을 파일에서 조금씩 읽어 전송하기 위한 객체"""
+
+    def __init__(self, fields, file_field, filename, path, content_type):
+        self.boundary = f"----wikitooutline{os.urandom(8).hex()}"
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+
+        head = b''
+        for key, value in fields.items():
+            head += (f"--{self.boundary}\r\n"
+                     f'Content-Disposition: form-data; name="{key}"\r\n\r\n'
+                     f"{value}\r\n").encode('utf-8')
+        head += (f"--{self.boundary}\r\n"
+                 f'Content-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+                 f"Content-Type: {content_type}\r\n\r\n").encode('utf-8')
+        tail = f"\r\n--{self.boundary}--\r\n".encode('utf-8')
+
+        self.parts = [head, path, tail]
+        self.len = len(head) + os.path.getsize(path) + len(tail)
+        self.current = None
+
+    def read(self, size=-1):
+        """다음 조각 반환 (머리말 → 파일 내용 → 맺음말 순서)"""
+        while self.parts or self.current:
+            if self.current is None:
+                part = self.parts.pop(0)
+                self.current = open(part, 'rb') if isinstance(part, str) else part
+            if isinstance(self.current, bytes):
+                chunk, self.current = self.current, None
+                return chunk
+            chunk = self.current.read(size if size and size > 0 else HASH_CHUNK_SIZE)
+            if chunk:
+                return chunk
+            self.current.close()
+            self.current = None
+        return b''
+
+
+def upload_outline_archive(filename):
+    """가져오기용 ZIP 파일을 Outline 첨부 파일로 업로드 (attachments.create)"""
+    api_base = get_outline_api_base()
+    headers = {
+        "Authorization": f"Bearer {outline_api_token}",
+        "Content-Type": "application/json"
+    }
+    payload = {
+        "name": os.path.basename(filename),
+        "contentType": "application/zip",
+        "size": os.path.getsize(filename),
+        "preset": "workspaceImport"
+    }
+
+    try:
+        response = requests.post(f"{api_base}/attachments.create",
+                                 headers=headers, json=payload, timeout=30)
+        if response.status_code != 200:
+            return False, f"attachments.create HTTP {response.status_code}"
+        data = response.json()['data']
+
+        # 로컬 저장소를 쓰는 Outline은 업로드 URL을 상대 경로로 돌려줌
+        outline_root = api_base.removesuffix('/api')
+        upload_url = data['uploadUrl']
+        if upload_url.startswith('/'):
+            upload_url = outline_root + upload_url
+
+        body = MultipartFileStream(data.get('form', {}), 'file',
+                                   os.path.basename(filename), str(filename), 'application/zip')
+        upload_headers = {"Content-Type": body.content_type, "Content-Length": str(body.len)}
+        # 외부 저장소(S3 등)로는 Outline 토큰을 보내지 않음
+        if upload_url.startswith(outline_root):
+            upload_headers["Authorization"] = f"Bearer {outline_api_token}"
+
+        response = requests.post(upload_url, headers=upload_headers, data=body, timeout=600)
+        if response.status_code not in (200, 201, 204):
+            return False, f"파일 업로드 HTTP {response.status_code}"
+
+        return True, data['attachment']['id']
+
+    except requests.exceptions.Timeout:
+        return False, "타임아웃"
+    except requests.exceptions.RequestException as e:
+        return False, str(e)
+
+
+def import_outline_archive(attachment_id):
+    """업로드한 ZIP으로 컬렉션 가져오기 시작 (collections.import)"""
+    headers = {
+        "Authorization": f"Bearer {outline_api_token}",
+        "Content-Type": "application/json"
+    }
+    payload = {"attachmentId": attachment_id, "format": "outline-markdown"}
+
+    try:
+        response = requests.post(f"{get_outline_api_base()}/collections.import",
+                                 headers=headers, json=payload, timeout=30)
+        if response.status_code != 200:
+            return False, f"collections.import HTTP {response.status_code}"
+        return True, response.json()['data']['fileOperation']['id']
 
     except requests.exceptions.Timeout:
         return False, "타임아웃 (30초)"
@@ -286,17 +1377,97 @@ def create_outline_document(title, content):
         return False, str(e)
 
 
+def wait_for_outline_import(file_operation_id):
+    """가져오기가 끝날 때까지 fileOperations.info로 상태 확인 (최대 IMPORT_TIMEOUT초)"""
+    headers = {
+        "Authorization": f"Bearer {outline_api_token}",
+        "Content-Type": "application/json"
+    }
+    endpoint = f"{get_outline_api_base()}/fileOperations.info"
+    deadline = time.time() + IMPORT_TIMEOUT
+    last_state = None
+    last_error = None
+
+    while time.time() < deadline:
+        try:
+            response = requests.post(endpoint, headers=headers,
+                                     json={"id": file_operation_id}, timeout=30)
+            if response.status_code == 200:
+                data = response.json()['data']
+                state = data.get('state')
+                if state != last_state:
+                    print(f"  가져오기 상태: {state}")
+                    last_state = state
+                if state == 'complete':
+                    return True, state
+                if state in ('error', 'expired'):
+                    return False, data.get('error') or state
+            else:
+                last_error = f"HTTP {response.status_code}"
+                try:
+                    last_error = response.json().get('message', last_error)
+                except ValueError:
+                    pass
+                # 토큰 오류나 없는 작업 등 4xx는 다시 시도해도 같은 결과
+                if 400 <= response.status_code < 500:
+                    return False, f"fileOperations.info {last_error}"
+                print(f"  ✗ 상태 확인 실패: {last_error}")
+        except requests.exceptions.RequestException as e:
+            last_error = str(e)
+            print(f"  ✗ 상태 확인 실패: {e}")
+
+        time.sleep(IMPORT_POLL_INTERVAL)
+
+    return False, (f"{IMPORT_TIMEOUT}초 안에 끝나지 않음 "
+                   f"(마지막 상태: {last_state}, 마지막 오류: {last_error})")
+
+
+def import_archive(archive):
+    """ZIP을 업로드하고 가져오기가 끝날 때까지 대기"""
+    print(f"\n[일괄 가져오기] {archive.filename} ({format_bytes(os.path.getsize(archive.filename))})")
+
+    started = time.time()
+    success, result = upload_outline_archive(archive.filename)
+    if not success:
+        print(f"  ✗ 업로드 실패: {result}")
+        return
+    print(f"  ✓ 업로드 완료 ({time.time() - started:.1f}초)")
+
+    success, result = import_outline_archive(result)
+    if not success:
+        print(f"  ✗ 가져오기 시작 실패: {result}")
+        return
+
+    success, result = wait_for_outline_import(result)
+    if success:
+        print(f"  ✓ 가져오기 완료: '{archive.collection_name}' 컬렉션 "
+              f"(업로드부터 {time.time() - started:.1f}초)")
+    else:
+        print(f"  ✗ 가져오기 실패: {result}")
+
+
 def main():
     """메인 실행 함수"""
+    args = parse_args()
+
     print("=" * 60)
     print("위키 페이지 → Outline 변환 도구")
     print("=" * 60)
 
+    # 업로드 검증은 위키 로그인 없이 Outline과 로컬 파일만 사용
+    if args.verify or args.reupload:
+        verify(max(1, args.workers), args.reupload)
+        return
+
     # 로그인
     if not login():
         print("로그인에 실패했습니다.")
         return
 
+    if args.plan:
+        plan(args.manifest or DEFAULT_MANIFEST_FILE, max(1, args.workers), bool(args.archive))
+        return
+
     # Outline Collection 목록 확인 (디버깅용)
     if use_outline:
         print("\n[Outline 설정 확인]")
@@ -321,84 +1492,154 @@ def main():
             print("  API URL과 Token을 확인하세요.")
         print()
 
-    # URL 목록 읽기
-    urls = read_urls_from_file('urls.txt')
+    # 작업 목록 읽기 (manifest가 있으면 제목 추출 단계 생략)
+    if args.manifest:
+        pages = read_manifest(args.manifest)
+    else:
+        pages = read_pages_from_urls('urls.txt')
 
-    if not urls:
+    if not pages:
         print("\n처리할 URL이 없습니다.")
         print("urls.txt 파일에 위키 페이지 URL을 추가하세요.")
         return
 
-    print(f"\n총 {len(urls)}개의 URL을 처리합니다.")
-    print("=" * 60)
+    # 작업 순서 결정을 위한 페이지 크기 조회 (prop=info 배치)
+    fill_pages_info(pages)
+    for page in pages:
+        if page.get('missing'):
+            print(f"  ✗ 존재하지 않는 페이지: {page['title']}")
+    pages = [p for p in pages if not p.get('missing')]
 
     # result 폴더 생성
     result_dir = Path('result')
     result_dir.mkdir(exist_ok=True)
 
-    # 각 URL 처리
-    success_count = 0
-    outline_success_count = 0
-    outline_fail_count = 0
-
-    for i, url in enumerate(urls, 1):
-        print(f"\n[{i}/{len(urls)}] 처리 중: {url}")
-
-        # URL에서 페이지 제목 추출
-        page_title = extract_page_title_from_url(url)
-
-        if not page_title:
-            print(f"  ✗ URL에서 페이지 제목을 추출할 수 없습니다.")
-            continue
-
-        print(f"  페이지 제목: {page_title}")
-
-        # 페이지 내용 가져오기
-        sections, wikitext = get_page_content_with_sections(page_title)
-
-        if wikitext is None:
-            print(f"  ✗ 페이지를 가져올 수 없습니다.")
-            continue
-
-        # Outline 포맷으로 변환
-        outline_content = convert_wikitext_to_outline(page_title, sections, wikitext)
-
-        # 파일명 생성 (페이지 제목 기반)
-        safe_filename = sanitize_filename(page_title)
-        output_file = result_dir / f"{safe_filename}.txt"
-
-        # 파일 저장 (백업용)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(outline_content)
+    # 리다이렉트와 중복 입력은 대상 문서의 별칭으로만 기록
+    document_map = DocumentMap(result_dir / DOCUMENT_MAP_FILE)
+    input_count = len(pages)
+    pages, aliases = collapse_aliases(pages)
+    for source, target in aliases.items():
+        document_map.add_alias(source, target, 'redirect')
+        print(f"  → 리다이렉트: '{source}' → '{target}' (별칭으로 기록)")
+    if input_count > len(pages):
+        print(f"  → 같은 문서를 가리키는 입력 {input_count - len(pages)}개를 합쳤습니다.")
+
+    workers = max(1, args.workers)
+    resize_session_pool(workers)
+    priority_titles = set()
+    if args.nav_first or args.priority:
+        first_letter_case = is_first_letter_case()
+        if args.nav_first:
+            priority_titles |= get_navigation_titles(first_letter_case)
+        if args.priority:
+            priority_titles |= read_priority_titles(args.priority, first_letter_case)
+
+    scheduler = WorkStealingScheduler(pages, workers, priority_titles)
+
+    # 일괄 가져오기 모드: 변환 결과를 처리하는 대로 ZIP에 추가
+    archive = None
+    if args.archive:
+        archive = MarkdownArchive(result_dir / f"{sanitize_filename(args.archive)}.zip",
+                                  args.archive)
+
+    print(f"\n총 {len(pages)}개의 페이지를 처리합니다. (동시 작업 {workers}개)")
+    print("=" * 60)
 
-        print(f"  ✓ 파일 저장: {output_file}")
+    # 각 페이지 처리
+    counts = {
+        'success': 0, 'outline_success': 0, 'outline_fail': 0,
+        'duplicate': 0, 'failed': 0, 'done': 0
+    }
+    durations = {}
+    print_lock = threading.Lock()
 
-        # Outline API로 문서 생성
-        if use_outline:
-            print(f"  → Outline에 문서 생성 중...")
-            success, result = create_outline_document(page_title, outline_content)
+    def worker(worker_id):
+        while True:
+            page = scheduler.next_page(worker_id)
+            if page is None:
+                return
 
-            if success:
-                print(f"  ✓ Outline 생성 완료: {result}")
-                outline_success_count += 1
-            else:
-                print(f"  ✗ Outline 생성 실패: {result}")
-                outline_fail_count += 1
-
-        success_count += 1
+            page_started = time.time()
+            try:
+                result = process_page(page, result_dir, document_map, archive)
+            except Exception as e:
+                # 한 페이지의 오류로 작업자가 멈추지 않도록 실패로 기록하고 계속 진행
+                result = {
+                    'log': [f"  ✗ 처리 중 오류: {type(e).__name__}: {e}"],
+                    'converted': False,
+                    'outline': None,
+                    'duplicate': False,
+                    'failed': True
+                }
+
+            with print_lock:
+                durations[id(page)] = time.time() - page_started
+                counts['done'] += 1
+                print(f"\n[{counts['done']}/{len(pages)}] 처리 중: {page.get('url', page['title'])}")
+                for line in result['log']:
+                    print(line)
+
+                if result['converted']:
+                    counts['success'] += 1
+                if result['duplicate']:
+                    counts['duplicate'] += 1
+                if result.get('failed'):
+                    counts['failed'] += 1
+                if result['outline'] is True:
+                    counts['outline_success'] += 1
+                elif result['outline'] is False:
+                    counts['outline_fail'] += 1
+
+            # 긴 실행이 중단되어도 이미 만든 문서의 매핑이 남도록 주기적으로 저장
+            document_map.save_if_due()
+
+    started = time.time()
+    # 중단(Ctrl+C) 시 작업자 스레드가 종료를 막지 않도록 daemon으로 실행
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(workers)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        document_map.save()
+        if archive is not None:
+            archive.close()
+    elapsed = time.time() - started
 
     # 완료 메시지
     print("\n" + "=" * 60)
-    print(f"완료! {success_count}/{len(urls)}개의 페이지를 변환했습니다.")
+    print(f"완료! {counts['success']}/{len(pages)}개의 페이지를 변환했습니다.")
+    if counts['failed'] > 0:
+        print(f"✗ 오류로 처리하지 못한 페이지: {counts['failed']}개")
     print(f"로컬 파일 위치: {result_dir.absolute()}")
+    print(f"별칭으로 기록 (업로드 생략): 리다이렉트 {len(aliases)}개, "
+          f"내용 중복 {counts['duplicate']}개")
+    print(f"문서 매핑: {document_map.filename}")
 
-    if use_outline:
+    if archive is not None:
+        print(f"가져오기 파일: {archive.filename} ({len(archive.names)}개 문서)")
+    elif use_outline:
         print(f"\nOutline 업로드 결과:")
-        print(f"  ✓ 성공: {outline_success_count}개")
-        if outline_fail_count > 0:
-            print(f"  ✗ 실패: {outline_fail_count}개")
+        print(f"  ✓ 성공: {counts['outline_success']}개")
+        if counts['outline_fail'] > 0:
+            print(f"  ✗ 실패: {counts['outline_fail']}개")
+
+    # 실제 처리 시간으로 입력 순서 처리와 크기순 처리의 전체 소요 시간 비교
+    print(f"\n작업 스케줄링 (동시 작업 {workers}개):")
+    print(f"  입력 순서 처리 시 예상: "
+          f"{simulate_makespan([durations.get(id(p), 0) for p in pages], workers):.1f}초")
+    print(f"  크기순(LPT) 처리 시 예상: "
+          f"{simulate_makespan([durations.get(id(p), 0) for p in scheduler.order], workers):.1f}초")
+    print(f"  실제 소요 시간: {elapsed:.1f}초")
     print("=" * 60)
 
+    if archive is not None:
+        if use_outline:
+            import_archive(archive)
+        else:
+            print("\nOutline 설정이 없어 가져오기 파일만 저장했습니다.")
+
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,11 @@
 import os
+import math
+import time
+import argparse
 import requests
 from collections import defaultdict
 from dotenv import load_dotenv
+from planning import get_site_statistics, estimate_work, print_estimate, write_manifest
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -25,6 +29,9 @@ if not all([api_url, username, password]):
 # 세션 생성
 session = requests.Session()
 
+# 사전 계획(--plan) 설정
+DEFAULT_MANIFEST_FILE = 'wiki_manifest.json'
+
 # 네임스페이스 이름 매핑 (일반적인 MediaWiki 네임스페이스)
 NAMESPACE_NAMES = {
     0: "Main (문서)",
@@ -172,6 +179,10 @@ def get_all_pages_with_info():
             page_info = {
                 'title': page_data['title'],
                 'namespace': page_data['ns'],
+                'pageid': page_data.get('pageid'),
+                'length': page_data.get('length', 0),
+                'lastrevid': page_data.get('lastrevid'),
+                'redirect': 'redirect' in page_data,
                 'categories': []
             }
 
@@ -197,6 +208,42 @@ def get_all_pages_with_info():
     return pages
 
 
+def plan(manifest_file, workers=1, archive=False):
+    """allpages 메타데이터만 조회하여 마이그레이션 작업량을 추정하고 manifest 저장
+
+    archive: convert_to_outline.py --archive 기준으로 추정
+    """
+    print("\n[사전 계획 모드] 메타데이터만 조회하여 작업량을 추정합니다.")
+
+    statistics = get_site_statistics(session, api_url)
+
+    # 목록 조회 배치의 평균 응답 시간으로 요청당 지연 시간 측정
+    started = time.time()
+    pages = get_all_pages_with_info()
+    batch_count = max(1, math.ceil(len(pages) / 50))
+    request_latency = (time.time() - started) / batch_count
+
+    # 전체 문서를 Outline으로 옮기는 경우를 기준으로 추정
+    upload_mode = 'archive' if archive else 'documents'
+    estimate = estimate_work(pages, request_latency, workers, upload_mode)
+    write_manifest(manifest_file, pages, estimate, statistics, 'allpages')
+
+    redirects = sum(1 for p in pages if p.get('redirect'))
+
+    print("\n" + "=" * 60)
+    print("사전 계획 결과")
+    print("=" * 60)
+    if statistics:
+        print(f"위키 통계: 문서 {statistics.get('pages', 'N/A')}개 "
+              f"(본문 {statistics.get('articles', 'N/A')}개)")
+    print(f"조회된 문서: {len(pages)}개 (목록 조회 요청 {batch_count}회)")
+    print(f"처리 대상 페이지: {estimate['pages']}개 (리다이렉트 별칭: {redirects}개)")
+    print_estimate(estimate)
+    print(f"\n✓ 작업 목록 저장: {manifest_file}")
+    print(f"  변환 실행: python convert_to_outline.py --manifest {manifest_file}")
+    print("=" * 60)
+
+
 def classify_by_category(pages):
     """카테고리별로 페이지 분류"""
     category_map = defaultdict(list)
@@ -247,10 +294,25 @@ def write_hierarchy(file, items, indent=0, prefix=""):
 
 # 메인 실행
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="위키 문서 구조 분석 도구")
+    parser.add_argument('--plan', action='store_true',
+                        help="메타데이터만 조회하여 작업량을 추정하고 manifest 저장")
+    parser.add_argument('--manifest', metavar='FILE',
+                        help=f"--plan으로 저장할 manifest 경로 (기본값: {DEFAULT_MANIFEST_FILE})")
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help="--plan 추정에 사용할 동시 작업 수 (기본값: 1)")
+    parser.add_argument('--archive', action='store_true',
+                        help="--plan 추정을 문서별 업로드 대신 일괄 가져오기(--archive) 기준으로")
+    args = parser.parse_args()
+
     if not login():
         print("로그인에 실패했습니다. username과 password를 확인하세요.")
         exit(1)
 
+    if args.plan:
+        plan(args.manifest or DEFAULT_MANIFEST_FILE, max(1, args.workers), args.archive)
+        exit(0)
+
     # 먼저 사이드바/내비게이션 구조 확인
     found_pages = check_sidebar_and_navigation()
 
@@ -0,0 +1,132 @@
+import json
+from datetime import datetime
+
+# 전송 시간 추정에 사용할 전송 속도 (바이트/초)
+ASSUMED_BANDWIDTH = 1024 * 1024
+
+# 일괄 가져오기 1회에 드는 Outline 요청 수
+# (attachments.create, 파일 업로드, collections.import, 상태 확인 최소 1회)
+ARCHIVE_IMPORT_REQUESTS = 4
+
+
+def get_site_statistics(session, api_url):
+    """위키 전체 통계 가져오기 (meta=siteinfo&siprop=statistics)"""
+    params = {
+        "action": "query",
+        "meta": "siteinfo",
+        "siprop": "statistics",
+        "format": "json"
+    }
+
+    response = session.get(api_url, params=params)
+    data = response.json()
+
+    return data.get('query', {}).get('statistics', {})
+
+
+def estimate_work(pages, request_latency, workers=1, upload_mode=None):
+    """페이지 정보로부터 요청 수, 전송량, 예상 소요 시간 계산
+
+    upload_mode: None(파일로만 저장), 'documents'(문서마다 documents.create),
+                 'archive'(ZIP 하나로 일괄 가져오기)
+    존재하지 않는 페이지와 리다이렉트 문서(대상 문서의 별칭으로만 기록)는 제외
+    """
+    pages = [p for p in pages if not p.get('missing') and not p.get('redirect')]
+    total_length = sum(p.get('length', 0) for p in pages)
+
+    # 업로드 본문은 변환된 위키텍스트와 제목 헤더로 구성
+    upload_bytes = 0
+    if upload_mode:
+        upload_bytes = sum(
+            p.get('length', 0) + len(p['title'].encode('utf-8')) + 4 for p in pages
+        )
+
+    # 로그인(2) + 페이지당 parse 요청(1)
+    wiki_requests = 2 + len(pages)
+    if upload_mode == 'documents':
+        # collections.list(1) + 문서당 documents.create(1)
+        outline_uploads = len(pages)
+        outline_requests = 1 + len(pages)
+    elif upload_mode == 'archive':
+        outline_uploads = 0
+        outline_requests = ARCHIVE_IMPORT_REQUESTS
+    else:
+        outline_uploads = 0
+        outline_requests = 0
+
+    # 페이지당 소요 시간 = 요청 지연 + 크기에 비례한 전송 시간
+    # (문서별 업로드는 페이지마다 업로드 요청과 전송이 한 번씩 더 있음)
+    per_page_uploads = 1 if upload_mode == 'documents' else 0
+    page_times = [
+        (1 + per_page_uploads) * request_latency
+        + p.get('length', 0) * (1 + per_page_uploads) / ASSUMED_BANDWIDTH
+        for p in pages
+    ]
+    # 작업자 수로 나눈 총량과 가장 오래 걸리는 페이지 중 큰 값
+    wall_time = max(sum(page_times) / workers, max(page_times, default=0))
+
+    # 일괄 가져오기는 변환이 끝난 뒤 ZIP 하나를 순서대로 업로드
+    if upload_mode == 'archive':
+        wall_time += outline_requests * request_latency + upload_bytes / ASSUMED_BANDWIDTH
+
+    return {
+        'pages': len(pages),
+        'upload_mode': upload_mode,
+        'wiki_requests': wiki_requests,
+        'outline_requests': outline_requests,
+        'outline_uploads': outline_uploads,
+        'download_bytes': total_length,
+        'upload_bytes': upload_bytes,
+        'request_latency': round(request_latency, 4),
+        'assumed_bandwidth': ASSUMED_BANDWIDTH,
+        'workers': workers,
+        'estimated_seconds': round(wall_time, 1)
+    }
+
+
+def format_bytes(size):
+    """바이트 수를 읽기 쉬운 단위로 변환"""
+    if size < 1024:
+        return f"{size} B"
+    for unit in ['KB', 'MB', 'GB']:
+        size /= 1024
+        if size < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}"
+
+
+def format_duration(seconds):
+    """초를 시:분:초 형식으로 변환"""
+    seconds = int(seconds)
+    return f"{seconds // 3600}시간 {seconds % 3600 // 60}분 {seconds % 60}초"
+
+
+def print_estimate(estimate):
+    """estimate_work 결과 출력"""
+    print(f"위키 API 요청: {estimate['wiki_requests']}회")
+    print(f"다운로드 예상량: {format_bytes(estimate['download_bytes'])}")
+    if estimate['upload_mode'] == 'documents':
+        print(f"Outline 업로드: {estimate['outline_uploads']}개 "
+              f"(API 요청 {estimate['outline_requests']}회, "
+              f"{format_bytes(estimate['upload_bytes'])})")
+    elif estimate['upload_mode'] == 'archive':
+        print(f"Outline 일괄 가져오기: ZIP 1개 "
+              f"(API 요청 약 {estimate['outline_requests']}회, "
+              f"압축 전 {format_bytes(estimate['upload_bytes'])})")
+    print(f"요청당 평균 지연: {estimate['request_latency'] * 1000:.0f}ms, "
+          f"가정한 전송 속도: {format_bytes(estimate['assumed_bandwidth'])}/s")
+    print(f"예상 소요 시간 (동시 작업 {estimate['workers']}개): "
+          f"{format_duration(estimate['estimated_seconds'])}")
+
+
+def write_manifest(filename, pages, estimate, statistics, source):
+    """실제 실행에서 그대로 사용할 수 있는 작업 목록(manifest) 저장"""
+    manifest = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'source': source,
+        'statistics': statistics,
+        'estimate': estimate,
+        'pages': pages
+    }
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)